@@ -1,10 +1,29 @@
+import asyncio
+import hashlib
+import io
+import json
+import logging
 import os
-import requests
+import re
+import tempfile
+import time
+from pathlib import Path
+import httpx
 from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file when running locally; the GitHub
+# Action already injects them.
+if not os.getenv("GITHUB_ACTIONS"):
+    load_dotenv()
+
+# AEGIS_LOG_LEVEL=DEBUG also logs GitHub error response bodies.
+LOG_LEVEL = (os.getenv("AEGIS_LOG_LEVEL") or "INFO").strip().upper()
+logging.basicConfig(level=logging.getLevelNamesMapping().get(LOG_LEVEL, logging.INFO), format="%(message)s")
+log = logging.getLogger(__name__)
+if LOG_LEVEL not in logging.getLevelNamesMapping():
+    log.warning("⚠️ Unknown AEGIS_LOG_LEVEL '%s'; using INFO.", LOG_LEVEL)
 
 # --- Configuration ---
 # These are now read from environment variables set by the GitHub Action
@@ -12,128 +31,477 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 REPO_OWNER = os.getenv("REPO_OWNER")
 REPO_NAME = os.getenv("REPO_NAME")
-PR_NUMBER = os.getenv("PR_NUMBER")
+PR_NUMBER = os.getenv("PR_NUMBER")  # A single number or a comma-separated list
 
 # --- Gemini Configuration ---
 GEMINI_MODEL = "gemini-1.5-flash"
+LLM_MAX_ATTEMPTS = 6
+# Status codes worth retrying; auth, permission and prompt errors fail at once.
+LLM_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Name of a pre-created Gemini CachedContent ("cachedContents/...") holding
+# REVIEWER_SYSTEM_PROMPT as its system instruction. When set, the system
+# prompt is not re-sent with every request.
+GEMINI_CACHED_CONTENT = os.getenv("GEMINI_CACHED_CONTENT")
+
+REVIEWER_PREAMBLE = (
+    "You are an expert code reviewer. Your goal is to provide a brief, helpful summary "
+    "of the changes in this pull request.\n"
+    "Please analyze the code diff you are given and provide a high-level summary in a few bullet points."
+)
+
+# Prompts sent after the system prompt. Most diffs are reviewed in one call;
+# multi-file diffs of at least MAP_REDUCE_MIN_CHARS are packed into at most
+# MAX_MAP_CALLS chunks of whole files, each reviewed with FILE_PROMPT, and the
+# notes are combined with one REDUCE_PROMPT call.
+DIFF_PROMPT = """Code Diff:
+```diff
+{diff}
+```
+Your review:
+"""
+FILE_PROMPT = """This is part of a larger pull request. Note what changed in these files and any problems, in a few short bullet points.
+Code Diff:
+```diff
+{patch}
+```
+Your notes:
+"""
+REDUCE_PROMPT = """Below are notes on each file changed in this pull request. Combine them into a single review.
+
+{notes}
+
+Your review:
+"""
+MAP_REDUCE_MIN_CHARS = 40_000
+MAX_MAP_CALLS = 6
+# Caps concurrent Gemini calls across every PR in the run.
+LLM_CONCURRENCY = 8
+LLM_SEMAPHORE = asyncio.Semaphore(LLM_CONCURRENCY)
+
+# Repo-specific review guidelines, sent as the system prompt ahead of the
+# diff so the reviewer knows the repository's layout and conventions. The
+# guide is a few hundred tokens and is billed on every call.
+REVIEW_GUIDE_PATH = Path(os.getenv("AEGIS_REVIEW_GUIDE", Path(__file__).with_name("REVIEW_GUIDE.md")))
+REVIEW_GUIDE = REVIEW_GUIDE_PATH.read_text(encoding="utf-8") if REVIEW_GUIDE_PATH.is_file() else ""
+REVIEWER_SYSTEM_PROMPT = f"{REVIEW_GUIDE}\n\n{REVIEWER_PREAMBLE}" if REVIEW_GUIDE else REVIEWER_PREAMBLE
+
+# --- Diff Limits ---
+MAX_DIFF_CHARS = 200_000
+MAX_FILE_CHANGED_LINES = 500
+# PRs below this many changed lines, or touching only docs, skip the LLM.
+TRIVIAL_DIFF_LINES = 10
+DOC_FILE_SUFFIXES = (".md", ".txt", ".rst")
+# .txt files that are dependency or build manifests rather than documentation.
+NON_DOC_TXT_RE = re.compile(r"(^|/)(requirements[^/]*|constraints[^/]*|CMakeLists)\.txt$")
+# PRs whose raw diff exceeds this are not downloaded or reviewed at all.
+MAX_DIFF_DOWNLOAD_BYTES = 5 * 1024 * 1024
+
+# --- Cache Configuration ---
+# Opt-in on-disk cache of PR diffs (revalidated by ETag) and of Gemini
+# responses (keyed by model and prompt), so reruns against an unchanged PR
+# neither re-download the diff nor repeat the LLM call.
+LLM_CACHE_ENABLED = os.getenv("AEGIS_LLM_CACHE") == "1"
+CACHE_DIR = Path(os.getenv("AEGIS_CACHE_DIR", "~/.cache/aegis")).expanduser()
 
 # --- !! NEW DEBUGGING BLOCK !! ---
-print("--- Initializing AI Reviewer ---")
-print(f"Repository: {REPO_OWNER}/{REPO_NAME}")
-print(f"Pull Request #: {PR_NUMBER}")
+log.info("--- Initializing AI Reviewer ---")
+log.info("Repository: %s/%s", REPO_OWNER, REPO_NAME)
+log.info("Pull Request(s) #: %s", PR_NUMBER)
 if not GITHUB_TOKEN:
-    print("❌ GITHUB_TOKEN environment variable is not set!")
+    log.error("❌ GITHUB_TOKEN environment variable is not set!")
 else:
-    print("✅ GITHUB_TOKEN found.")
+    log.info("✅ GITHUB_TOKEN found.")
 if not GEMINI_API_KEY:
-    print("❌ GEMINI_API_KEY environment variable is not set!")
+    log.error("❌ GEMINI_API_KEY environment variable is not set!")
 else:
-    print("✅ GEMINI_API_KEY found.")
+    log.info("✅ GEMINI_API_KEY found.")
 # -----------------------------------
 
+# --- Gemini Client ---
+# Built once so every review reuses the same client and its connections.
+LLM = None
+if GEMINI_API_KEY:
+    if GEMINI_CACHED_CONTENT:
+        LLM = ChatGoogleGenerativeAI(
+            model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY, cached_content=GEMINI_CACHED_CONTENT, max_retries=0
+        )
+    else:
+        LLM = ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY, max_retries=0)
+
+# --- HTTP Client ---
+# One pooled HTTP/2 client is shared by every PR so diff fetches and comment
+# posts for independent PRs can run concurrently over kept-alive connections.
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+HTTP_HEADERS = {
+    "Authorization": f"Bearer {GITHUB_TOKEN}",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+HTTP_RETRIES = 3
+HTTP_RETRY_STATUSES = {429, 502, 503, 504}
+
+
+def create_client() -> httpx.AsyncClient:
+    """Creates the shared async client used for all GitHub API calls."""
+    # The transport retries failed connects; status retries live in send_request.
+    return httpx.AsyncClient(
+        headers=HTTP_HEADERS,
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES),
+    )
+
+
+class DiffTooLargeError(Exception):
+    """Raised when a pull request diff exceeds MAX_DIFF_DOWNLOAD_BYTES."""
+
+
+async def send_request(
+    client: httpx.AsyncClient, method: str, url: str, stream: bool = False, **kwargs
+) -> httpx.Response:
+    """Sends a request, retrying rate-limited and transient gateway errors with backoff.
 
-def get_pr_diff(owner: str, repo: str, pr_number: int) -> str | None:
+    With stream=True the body is left unread; the caller must close the response.
+    """
+    request = client.build_request(method, url, **kwargs)
+    for attempt in range(HTTP_RETRIES + 1):
+        response = await client.send(request, stream=stream)
+        if response.status_code not in HTTP_RETRY_STATUSES or attempt == HTTP_RETRIES:
+            return response
+        await response.aclose()
+        await asyncio.sleep(0.5 * 2 ** attempt)
+    return response
+
+
+def diff_cache_paths(owner: str, repo: str, pr_number: int) -> tuple[Path, Path]:
+    """Returns the (diff body, ETag) cache files for a pull request."""
+    stem = f"diff-{owner}-{repo}-{pr_number}"
+    return CACHE_DIR / f"{stem}.diff", CACHE_DIR / f"{stem}.etag"
+
+async def get_pr_diff(client: httpx.AsyncClient, owner: str, repo: str, pr_number: int) -> str | None:
     """Fetches the diff of a specific GitHub pull request."""
     if not all([owner, repo, pr_number, GITHUB_TOKEN]):
-        print("❌ Missing required info for fetching diff.")
+        log.error("❌ Missing required info for fetching diff.")
         return None
 
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    headers = {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3.diff",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+    headers = {"Accept": "application/vnd.github.v3.diff", "Accept-Encoding": "gzip"}
+    diff_file, etag_file = diff_cache_paths(owner, repo, pr_number)
+    cached_diff = None
+    if LLM_CACHE_ENABLED and etag_file.is_file():
+        try:
+            cached_diff = diff_file.read_text(encoding="utf-8")
+            headers["If-None-Match"] = etag_file.read_text(encoding="utf-8")
+        except OSError as err:
+            log.warning("⚠️ Could not read cached diff for PR #%s: %s", pr_number, err)
+            cached_diff = None
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        print(f"✅ Successfully fetched diff for PR #{pr_number}.")
-        return response.text
-    except requests.exceptions.HTTPError as http_err:
-        print(f"❌ HTTP error occurred while fetching diff: {http_err}")
-        print(f"   Response body: {response.text}")
+        response = await send_request(client, "GET", url, stream=True, headers=headers)
+        try:
+            if response.status_code == 304:
+                log.info("✅ Diff for PR #%s is unchanged; using cached copy.", pr_number)
+                return cached_diff
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            # Content-Length is the compressed size, so this only rejects diffs
+            # that are certainly too large; the loop below enforces the real cap.
+            if int(response.headers.get("Content-Length", 0)) > MAX_DIFF_DOWNLOAD_BYTES:
+                raise DiffTooLargeError(response.headers["Content-Length"])
+            buf = io.BytesIO()
+            async for chunk in response.aiter_bytes(65536):
+                buf.write(chunk)
+                if buf.tell() > MAX_DIFF_DOWNLOAD_BYTES:
+                    raise DiffTooLargeError(buf.tell())
+        finally:
+            await response.aclose()
+        log.info("✅ Successfully fetched diff for PR #%s.", pr_number)
+        diff = buf.getvalue().decode(response.encoding or "utf-8", errors="replace")
+        etag = response.headers.get("ETag")
+        if LLM_CACHE_ENABLED and etag:
+            try:
+                write_cache_file(diff_file, diff)
+                write_cache_file(etag_file, etag)
+            except OSError as err:
+                log.warning("⚠️ Could not cache diff for PR #%s: %s", pr_number, err)
+        return diff
+    except DiffTooLargeError:
+        log.warning("⚠️ Diff for PR #%s exceeds %s bytes.", pr_number, MAX_DIFF_DOWNLOAD_BYTES)
+        raise
+    except httpx.HTTPStatusError as http_err:
+        log.error("❌ HTTP error occurred while fetching diff: %s", http_err)
+        # Guarded because .text decodes the whole body before log.debug runs.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("   Response body: %s", http_err.response.text)
     except Exception as err:
-        print(f"❌ An other error occurred while fetching diff: {err}")
+        log.error("❌ An other error occurred while fetching diff: %s", err)
     return None
 
-def post_comment_on_pr(owner: str, repo: str, pr_number: int, comment_body: str) -> bool:
+async def post_comment_on_pr(client: httpx.AsyncClient, owner: str, repo: str, pr_number: int, comment_body: str) -> bool:
     """Posts a comment on a specific GitHub pull request."""
     if not all([owner, repo, pr_number, GITHUB_TOKEN]):
-        print("❌ Missing required info for posting comment.")
+        log.error("❌ Missing required info for posting comment.")
         return False
 
     url = f"https://api.github.com/repos/{owner}/{repo}/issues/{pr_number}/comments"
-    headers = {
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+    headers = {"Accept": "application/vnd.github.v3+json"}
     payload = {"body": comment_body}
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = await send_request(client, "POST", url, headers=headers, json=payload)
         response.raise_for_status()
-        print(f"✅ Successfully posted AI review comment on PR #{pr_number}.")
-        print(f"   View it here: {response.json().get('html_url')}")
+        log.info("✅ Successfully posted AI review comment on PR #%s.", pr_number)
+        log.info("   View it here: %s", response.json().get('html_url'))
         return True
-    except requests.exceptions.HTTPError as http_err:
-        print(f"❌ HTTP error occurred while posting comment: {http_err}")
-        print(f"   Response body: {response.text}")
+    except httpx.HTTPStatusError as http_err:
+        log.error("❌ HTTP error occurred while posting comment: %s", http_err)
+        # Guarded because .text decodes the whole body before log.debug runs.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("   Response body: %s", http_err.response.text)
     except Exception as err:
-        print(f"❌ An other error occurred while posting comment: {err}")
+        log.error("❌ An other error occurred while posting comment: %s", err)
     return False
 
-def analyze_code_changes(diff: str) -> str:
-    """Analyzes the code changes using the Gemini API and generates a review."""
-    if not GEMINI_API_KEY:
+# Files whose changes carry no review value: lockfiles, vendored dependencies
+# and generated or minified build output. dist/ and build/ only count at the
+# repository root, since nested directories with those names are often source.
+SKIPPED_PATH_RE = re.compile(
+    r"(^|/)(package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|Pipfile\.lock|Cargo\.lock|go\.sum)$"
+    r"|(^|/)(vendor|node_modules|third_party)/|^(dist|build)/"
+    r"|\.min\.(js|css)$|\.map$|_pb2(_grpc)?\.py$"
+)
+
+
+def split_diff(diff: str) -> list[str]:
+    """Splits a unified diff into one chunk per changed file."""
+    chunks = re.split(r"(?m)^(?=diff --git )", diff)
+    return [chunk for chunk in chunks if chunk.strip()]
+
+def diff_path(file_diff: str) -> str:
+    """Returns the post-change path of a single-file diff chunk."""
+    header = file_diff.split("\n", 1)[0]
+    match = re.match(r"diff --git a/(.+?) b/(.+)$", header)
+    return match.group(2) if match else ""
+
+def count_changed_lines(file_diff: str) -> int:
+    """Counts added and removed lines in a single-file diff chunk."""
+    return sum(
+        1 for line in file_diff.splitlines()
+        if line.startswith(("+", "-")) and not line.startswith(("+++", "---"))
+    )
+
+def filter_diff(raw: str) -> str:
+    """Drops binary, lock, vendored and generated files from a raw unified diff."""
+    kept = []
+    for file_diff in split_diff(raw):
+        path = diff_path(file_diff)
+        if "\nBinary files " in file_diff or "\nGIT binary patch" in file_diff:
+            log.info("   Skipping binary file: %s", path)
+        elif SKIPPED_PATH_RE.search(path):
+            log.info("   Skipping non-code file: %s", path)
+        else:
+            kept.append(file_diff)
+    return "".join(kept)
+
+def cap_diff(diff: str) -> str:
+    """Drops oversized files and caps the diff at MAX_DIFF_CHARS."""
+    kept = []
+    size = 0
+    for file_diff in split_diff(diff):
+        path = diff_path(file_diff)
+        if count_changed_lines(file_diff) > MAX_FILE_CHANGED_LINES:
+            log.info("   Skipping file with more than %s changed lines: %s", MAX_FILE_CHANGED_LINES, path)
+        elif size + len(file_diff) > MAX_DIFF_CHARS:
+            log.info("   Skipping file past the %s-character diff budget: %s", MAX_DIFF_CHARS, path)
+        else:
+            kept.append(file_diff)
+            size += len(file_diff)
+    return "".join(kept)
+
+def trivial_change_reason(diff: str) -> str | None:
+    """Returns why a diff is too trivial to send to the LLM, or None if it needs a review."""
+    changed = [
+        line for line in diff.splitlines()
+        if line.startswith(("+", "-")) and not line.startswith(("+++", "---"))
+    ]
+    if len(changed) < TRIVIAL_DIFF_LINES:
+        return f"only {len(changed)} changed lines"
+    paths = [diff_path(file_diff) for file_diff in split_diff(diff)]
+    if paths and all(path.endswith(DOC_FILE_SUFFIXES) and not NON_DOC_TXT_RE.search(path) for path in paths):
+        return "documentation-only change"
+    return None
+
+def is_transient_llm_error(err: BaseException) -> bool:
+    """Returns True for rate-limit, server and timeout errors, following wrapped causes."""
+    while err is not None:
+        if isinstance(err, (TimeoutError, ConnectionError)):
+            return True
+        code = getattr(err, "code", None)
+        if getattr(err, "status_code", None) in LLM_RETRY_STATUSES or code in LLM_RETRY_STATUSES:
+            return True
+        err = err.__cause__ or err.__context__
+    return False
+
+def write_cache_file(path: Path, text: str) -> None:
+    """Atomically writes a cache file so an interrupted run never leaves a truncated entry."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp", delete=False) as tmp:
+        tmp.write(text)
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+def pack_files(files: list[str]) -> list[list[str]]:
+    """Groups consecutive file diffs into at most MAX_MAP_CALLS chunks of roughly equal size."""
+    target = max(MAP_REDUCE_MIN_CHARS, -(-sum(map(len, files)) // MAX_MAP_CALLS))
+    while True:
+        chunks: list[list[str]] = []
+        size = 0
+        for file_diff in files:
+            if chunks and size + len(file_diff) <= target:
+                chunks[-1].append(file_diff)
+                size += len(file_diff)
+            else:
+                chunks.append([file_diff])
+                size = len(file_diff)
+        if len(chunks) <= MAX_MAP_CALLS:
+            return chunks
+        target *= 2
+
+async def generate(user_prompt: str) -> str:
+    """Runs one Gemini completion with caching and transient-error retries; raises on failure."""
+    messages = [] if GEMINI_CACHED_CONTENT else [SystemMessage(content=REVIEWER_SYSTEM_PROMPT)]
+    messages.append(HumanMessage(content=user_prompt))
+
+    cache_file = None
+    if LLM_CACHE_ENABLED:
+        key = hashlib.sha256(f"{GEMINI_MODEL}\0{REVIEWER_SYSTEM_PROMPT}\0{user_prompt}".encode()).hexdigest()
+        cache_file = CACHE_DIR / f"{key}.txt"
+        if cache_file.is_file():
+            try:
+                cached_response = cache_file.read_text(encoding="utf-8")
+                log.info("✅ Reusing cached AI response (%s).", key[:12])
+                return cached_response
+            except OSError as err:
+                log.warning("⚠️ Could not read cached AI response (%s): %s", key[:12], err)
+
+    for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
+        try:
+            response = None
+            async with LLM_SEMAPHORE:
+                async for chunk in LLM.astream(messages):
+                    response = chunk if response is None else response + chunk
+            if response is None:
+                raise RuntimeError("Gemini returned an empty stream")
+            break
+        except Exception as e:
+            if attempt == LLM_MAX_ATTEMPTS or not is_transient_llm_error(e):
+                raise
+            delay = 2 ** (attempt - 1)
+            log.warning("⚠️ AI analysis attempt %s failed (%s); retrying in %ss...", attempt, e, delay)
+            await asyncio.sleep(delay)
+
+    usage = response.usage_metadata or {}
+    cached_tokens = usage.get("input_token_details", {}).get("cache_read", 0)
+    log.info("   Tokens: %s in (%s cached), %s out", usage.get('input_tokens', 0), cached_tokens, usage.get('output_tokens', 0))
+    if cache_file is not None:
+        try:
+            write_cache_file(cache_file, response.content)
+        except OSError as err:
+            log.warning("⚠️ Could not cache AI response: %s", err)
+    return response.content
+
+async def analyze_code_changes(diff: str) -> str:
+    """Analyzes the code changes using the Gemini API and generates a review.
+
+    Large multi-file diffs are split into a few chunks of whole files that are
+    reviewed in parallel, then the notes are combined into one review by a
+    final call.
+    """
+    if LLM is None:
         return "Cannot analyze code because GEMINI_API_KEY is not set."
         
-    print(f"🧠 Analyzing diff with Gemini model: {GEMINI_MODEL}...")
-    llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=GEMINI_API_KEY)
-
-    prompt_template = f"""
-    You are an expert code reviewer. Your goal is to provide a brief, helpful summary of the changes in this pull request.
-    Please analyze the following code diff and provide a high-level summary in a few bullet points.
-    Code Diff:
-    ```diff
-    {diff}
-    ```
-    Your review:
-    """
+    log.info("🧠 Analyzing diff with Gemini model: %s...", GEMINI_MODEL)
+    files = split_diff(diff)
     try:
-        response = llm.invoke(prompt_template)
-        print("✅ AI analysis complete.")
-        return response.content
+        if len(files) <= 1 or len(diff) < MAP_REDUCE_MIN_CHARS:
+            review = await generate(DIFF_PROMPT.format(diff=diff))
+        else:
+            chunks = pack_files(files)
+            # A TaskGroup cancels the remaining map calls as soon as one fails.
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(generate(FILE_PROMPT.format(patch="".join(c)))) for c in chunks]
+            combined = "\n\n".join(
+                f"#### {', '.join(diff_path(f) for f in chunk)}\n{task.result()}"
+                for chunk, task in zip(chunks, tasks)
+            )
+            review = await generate(REDUCE_PROMPT.format(notes=combined))
     except Exception as e:
-        print(f"❌ An error occurred during AI analysis: {e}")
+        log.error("❌ An error occurred during AI analysis: %s", e)
         return "An error occurred while analyzing the code. Please check the logs."
 
-def main():
+    log.info("✅ AI analysis complete.")
+    return review
+
+async def process_pr(client: httpx.AsyncClient, pr_number: int) -> bool:
+    """Fetches, reviews and comments on a single pull request."""
+    try:
+        diff_content = await get_pr_diff(client, REPO_OWNER, REPO_NAME, pr_number)
+    except DiffTooLargeError:
+        too_large_comment = (
+            "### 🤖 Aegis AI Review\n\n"
+            f"This pull request's diff is larger than {MAX_DIFF_DOWNLOAD_BYTES // (1024 * 1024)} MB, "
+            "so it was not reviewed automatically. Consider splitting it into smaller PRs."
+        )
+        return await post_comment_on_pr(client, REPO_OWNER, REPO_NAME, pr_number, too_large_comment)
+
+    if not diff_content:
+        log.error("--- Fetching diff for PR #%s failed. Cannot proceed with review. ---", pr_number)
+        return False
+
+    trivial_reason = trivial_change_reason(diff_content)
+    if trivial_reason:
+        log.info("⏭️ Skipping AI analysis for PR #%s: %s.", pr_number, trivial_reason)
+        ai_review = "Trivial change — no detailed review needed."
+    elif not (diff_content := cap_diff(filter_diff(diff_content))):
+        ai_review = "Only binary, generated, vendored, lock or oversized files changed — nothing to review."
+    else:
+        ai_review = await analyze_code_changes(diff_content)
+    final_comment = f"### 🤖 Aegis AI Review\n\n{ai_review}"
+
+    success = await post_comment_on_pr(client, REPO_OWNER, REPO_NAME, pr_number, final_comment)
+
+    if success:
+        log.info("--- AI Review of PR #%s complete. ---", pr_number)
+    else:
+        log.error("--- Posting AI review on PR #%s failed. ---", pr_number)
+    return success
+
+async def main():
     """Main execution function."""
-    print("--- Running AI Pull Request Reviewer (Analysis Phase) ---")
+    log.info("--- Running AI Pull Request Reviewer (Analysis Phase) ---")
+    started = time.monotonic()
     
-    # The PR number needs to be an integer
+    # The PR numbers need to be integers
     try:
-        pr_number_int = int(PR_NUMBER)
-    except (ValueError, TypeError):
-        print(f"❌ Invalid PR_NUMBER: '{PR_NUMBER}'. Must be an integer.")
+        pr_numbers = [int(n) for n in PR_NUMBER.split(",") if n.strip()]
+    except (ValueError, AttributeError):
+        log.error("❌ Invalid PR_NUMBER: '%s'. Must be an integer or a comma-separated list of integers.", PR_NUMBER)
+        return
+    if not pr_numbers:
+        log.error("❌ Invalid PR_NUMBER: '%s'. Must be an integer or a comma-separated list of integers.", PR_NUMBER)
         return
 
-    diff_content = get_pr_diff(REPO_OWNER, REPO_NAME, pr_number_int)
+    async with create_client() as client:
+        results = await asyncio.gather(*[process_pr(client, n) for n in pr_numbers])
 
-    if diff_content:
-        ai_review = analyze_code_changes(diff_content)
-        final_comment = f"### 🤖 Aegis AI Review\n\n{ai_review}"
-        
-        success = post_comment_on_pr(REPO_OWNER, REPO_NAME, pr_number_int, final_comment)
-
-        if success:
-            print("\n--- AI Review complete. ---")
-        else:
-            print("\n--- Posting AI review failed. ---")
-    else:
-        print("\n--- Fetching diff failed. Cannot proceed with review. ---")
+    # One machine-readable summary line per run.
+    log.info(json.dumps({
+        "repository": f"{REPO_OWNER}/{REPO_NAME}",
+        "model": GEMINI_MODEL,
+        "reviewed": [n for n, ok in zip(pr_numbers, results) if ok],
+        "failed": [n for n, ok in zip(pr_numbers, results) if not ok],
+        "duration_s": round(time.monotonic() - started, 2),
+    }))
 
 
 if __name__ == "__main__":
-    main()
-
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+import importlib.util
+import unittest
+
+DEPENDENCIES = ("httpx", "dotenv", "langchain_core", "langchain_google_genai")
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in DEPENDENCIES)
+
+if HAS_DEPENDENCIES:
+    from pr_reviewer_agent import MAX_DIFF_CHARS, MAX_FILE_CHANGED_LINES, cap_diff, diff_path, filter_diff, split_diff
+
+
+def file_diff(path: str, removed: list[str], added: list[str]) -> str:
+    """Builds a single-file unified diff with one hunk."""
+    lines = [
+        f"diff --git a/{path} b/{path}",
+        f"--- a/{path}",
+        f"+++ b/{path}",
+        f"@@ -1,{len(removed)} +1,{len(added)} @@",
+    ]
+    lines += [f"-{line}" for line in removed]
+    lines += [f"+{line}" for line in added]
+    return "\n".join(lines) + "\n"
+
+
+def binary_diff(path: str) -> str:
+    """Builds a single-file diff for a changed binary file."""
+    return f"diff --git a/{path} b/{path}\nBinary files a/{path} and b/{path} differ\n"
+
+
+def kept_paths(diff: str) -> list[str]:
+    return [diff_path(chunk) for chunk in split_diff(diff)]
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "reviewer dependencies are not installed")
+class FilterDiffTest(unittest.TestCase):
+    def test_keeps_source_files(self):
+        diff = file_diff("app.py", ["x = 1"], ["x = 2"])
+        self.assertEqual(filter_diff(diff), diff)
+
+    def test_keeps_nested_build_and_dist_directories(self):
+        diff = file_diff("src/build/x.py", [], ["x = 1"]) + file_diff("pkg/dist/y.py", [], ["y = 1"])
+        self.assertEqual(kept_paths(filter_diff(diff)), ["src/build/x.py", "pkg/dist/y.py"])
+
+    def test_drops_root_build_and_dist_directories(self):
+        diff = file_diff("dist/app.js", [], ["a()"]) + file_diff("build/lib/x.py", [], ["x = 1"])
+        self.assertEqual(filter_diff(diff), "")
+
+    def test_drops_lockfiles_at_any_depth(self):
+        for path in ("package-lock.json", "web/yarn.lock", "services/api/poetry.lock", "tools/go.sum"):
+            with self.subTest(path=path):
+                self.assertEqual(filter_diff(file_diff(path, [], ["x"])), "")
+
+    def test_drops_vendored_and_minified_files(self):
+        diff = file_diff("lib/vendor/dep.go", [], ["x"]) + file_diff("static/app.min.js", [], ["x"])
+        self.assertEqual(filter_diff(diff), "")
+
+    def test_drops_binary_patches(self):
+        diff = binary_diff("docs/logo.png") + file_diff("app.py", [], ["x = 1"])
+        self.assertEqual(kept_paths(filter_diff(diff)), ["app.py"])
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "reviewer dependencies are not installed")
+class CapDiffTest(unittest.TestCase):
+    def test_keeps_file_at_changed_line_limit(self):
+        diff = file_diff("big.py", [], ["x"] * MAX_FILE_CHANGED_LINES)
+        self.assertEqual(cap_diff(diff), diff)
+
+    def test_drops_file_over_changed_line_limit(self):
+        diff = file_diff("big.py", [], ["x"] * (MAX_FILE_CHANGED_LINES + 1)) + file_diff("small.py", [], ["y"])
+        self.assertEqual(kept_paths(cap_diff(diff)), ["small.py"])
+
+    def test_drops_files_past_character_budget(self):
+        line = "x" * 999
+        per_file = (MAX_DIFF_CHARS // 3) // (len(line) + 2)
+        diff = "".join(file_diff(f"f{i}.py", [], [line] * per_file) for i in range(4))
+        capped = cap_diff(diff)
+        self.assertLessEqual(len(capped), MAX_DIFF_CHARS)
+        self.assertEqual(kept_paths(capped), ["f0.py", "f1.py", "f2.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import importlib.util
+import unittest
+
+DEPENDENCIES = ("httpx", "dotenv", "langchain_core", "langchain_google_genai")
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in DEPENDENCIES)
+
+if HAS_DEPENDENCIES:
+    from pr_reviewer_agent import trivial_change_reason
+
+
+def file_diff(path: str, removed: list[str], added: list[str]) -> str:
+    """Builds a single-file unified diff with one hunk."""
+    lines = [
+        f"diff --git a/{path} b/{path}",
+        f"--- a/{path}",
+        f"+++ b/{path}",
+        f"@@ -1,{len(removed)} +1,{len(added)} @@",
+    ]
+    lines += [f"-{line}" for line in removed]
+    lines += [f"+{line}" for line in added]
+    return "\n".join(lines) + "\n"
+
+
+STATEMENTS = [f"step_{i}()" for i in range(6)]
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "reviewer dependencies are not installed")
+class TrivialChangeReasonTest(unittest.TestCase):
+    def test_small_diff_is_trivial(self):
+        diff = file_diff("app.py", ["x = 1"], ["x = 2"])
+        self.assertEqual(trivial_change_reason(diff), "only 2 changed lines")
+
+    def test_docs_only_diff_is_trivial(self):
+        diff = file_diff("README.md", STATEMENTS, [s.upper() for s in STATEMENTS])
+        self.assertEqual(trivial_change_reason(diff), "documentation-only change")
+
+    def test_dependency_manifests_are_reviewed(self):
+        for path in ("requirements.txt", "requirements-dev.txt", "ci/constraints.txt", "CMakeLists.txt"):
+            with self.subTest(path=path):
+                diff = file_diff(path, STATEMENTS, [s.upper() for s in STATEMENTS])
+                self.assertIsNone(trivial_change_reason(diff))
+
+    def test_dedent_out_of_block_is_reviewed(self):
+        removed = ["if admin:"] + [f"    {s}" for s in STATEMENTS]
+        added = ["if admin:", "    pass"] + STATEMENTS
+        diff = file_diff("auth.py", removed, added)
+        self.assertIsNone(trivial_change_reason(diff))
+
+    def test_reordered_statements_are_reviewed(self):
+        diff = file_diff("job.py", STATEMENTS, list(reversed(STATEMENTS)))
+        self.assertIsNone(trivial_change_reason(diff))
+
+    def test_code_moved_between_files_is_reviewed(self):
+        diff = file_diff("a.py", STATEMENTS, []) + file_diff("b.py", [], STATEMENTS)
+        self.assertIsNone(trivial_change_reason(diff))
+
+
+if __name__ == "__main__":
+    unittest.main()